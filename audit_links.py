@@ -6,11 +6,22 @@ Scans all HTML files, extracts internal and external links,
 checks HTTP status codes, stores results in SQLite, and
 generates link_summary.md.
 
+HTML parsing uses lxml when it is installed (much faster) and falls
+back to the stdlib html.parser otherwise. Likewise, external checks
+reuse keep-alive connections through requests when it is installed
+and fall back to urllib otherwise.
+
+Without lxml, the script is pure stdlib and runs unchanged under PyPy,
+whose JIT speeds up the html.parser callbacks several times over:
+    pypy3 audit_links.py --local-only
+
 Usage:
     python3 audit_links.py              # Full audit (scan + check external links)
     python3 audit_links.py --local-only # Scan links without checking external URLs
     python3 audit_links.py --summary    # Regenerate summary from existing DB
     python3 audit_links.py --broken     # Show only broken links from DB
+    python3 audit_links.py --recheck    # Full audit, ignoring recently cached external results
+    python3 audit_links.py --fast-parse # Extract links with regexes instead of an HTML parser
 """
 
 import argparse
@@ -20,28 +31,76 @@ import re
 import sqlite3
 import ssl
 import sys
+import threading
 import time
 import urllib.error
 import urllib.request
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from functools import partial
 from html.parser import HTMLParser
+from itertools import groupby, zip_longest
+from operator import itemgetter
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
+try:
+    import lxml.etree
+except ImportError:  # lxml is optional; fall back to the stdlib parser
+    lxml = None
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # requests is optional; fall back to urllib
+    requests = None
+
 SITE_ROOT = Path(__file__).parent
 BASE_URL = "https://metergeist.com"
 DB_PATH = SITE_ROOT / "link_audit.db"
 SUMMARY_PATH = SITE_ROOT / "link_summary.md"
 USER_AGENT = "metergeist-link-checker/1.0 (+https://metergeist.com)"
+# UTC timestamps stored in the DB; fixed width, so they compare correctly as strings
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+# External link checking: total concurrent requests, and per-host limits
+MAX_WORKERS = 20
+HOST_CONCURRENCY = 2  # requests in flight to any one host
+HOST_DELAY = 0.3  # seconds between request starts to the same host
+COMMIT_EVERY = 50  # check results written per transaction
+FRESH_HOURS = 24  # URLs that checked OK more recently than this are not re-checked
 
 # Files to skip (internal tools, not published content)
 SKIP_FILES = {"dashboard.html", "film-audit.html", "audit_links.py"}
 
+# hrefs that never point at a page (in-page anchors, mail, scripts, phone)
+SKIP_LINK_RE = re.compile(r"^(?:#|mailto:|javascript:|tel:)")
+# Absolute URLs on this site, e.g. https://metergeist.com/cameras/
+SITE_URL_RE = re.compile(r"^https?://(?:www\.)?metergeist\.com(?=[/?#]|$)")
+# Absolute URLs with a host; checked after SITE_URL_RE, so always external
+EXTERNAL_URL_RE = re.compile(r"^https?://[^/?#]")
+
+# --fast-parse: <a href=...>text</a> and <title>, matched over raw bytes
+ANCHOR_RE = re.compile(
+    rb"""<a\b[^>]*?\shref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))[^>]*>(.*?)</a>""",
+    re.IGNORECASE | re.DOTALL,
+)
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(rb"<[^>]+>")
+# Blanked first, so commented-out markup and JS string templates don't count
+HIDDEN_RE = re.compile(rb"<!--.*?-->|<script\b.*?</script>|<style\b.*?</style>", re.IGNORECASE | re.DOTALL)
+
 
 class LinkExtractor(HTMLParser):
-    """Extract all <a href> links and the page title from HTML."""
+    """Extract all <a href> links and the page title from HTML.
+
+    Pure-Python fallback used by extract_links() when lxml is missing.
+    """
 
     def __init__(self):
+        # convert_charrefs (the default) unescapes entities inside the parser,
+        # so data arrives already decoded and no entity callbacks are needed
         super().__init__()
         self.links = []  # [(href, link_text)]
         self.title = ""
@@ -50,6 +109,7 @@ class LinkExtractor(HTMLParser):
         self._current_text_parts = []
         self._in_title = False
         self._title_parts = []
+        self._seen_title = False
 
     def handle_starttag(self, tag, attrs):
         if tag == "a":
@@ -78,28 +138,111 @@ class LinkExtractor(HTMLParser):
             self._current_href = None
             self._current_text_parts = []
         elif tag == "title" and self._in_title:
-            self.title = " ".join(self._title_parts).strip()
+            # First wins; later ones, and any inside a link, are inline SVG
+            if not self._seen_title and not self._in_a:
+                self.title = " ".join(" ".join(self._title_parts).split())
+                self._seen_title = True
             self._in_title = False
 
-    def handle_entityref(self, name):
-        char = html.unescape(f"&{name};")
-        if self._in_a:
-            self._current_text_parts.append(char)
-        if self._in_title:
-            self._title_parts.append(char)
 
-    def handle_charref(self, name):
-        char = html.unescape(f"&#{name};")
-        if self._in_a:
-            self._current_text_parts.append(char)
-        if self._in_title:
-            self._title_parts.append(char)
+def extract_links(file_path):
+    """Return (title, [(href, link_text)]) for an HTML file.
+
+    With lxml the file is streamed through iterparse, and everything
+    before each finished top-level <a> is discarded, so the partial tree
+    only holds markup since the last link. Without lxml, LinkExtractor
+    parses the whole decoded file. Either way the page title is the first
+    <title> outside any <a>; those inside links are inline SVG icon labels
+    and count as link text instead.
+    """
+    if lxml is None:
+        extractor = LinkExtractor()
+        extractor.feed(file_path.read_bytes().decode("utf-8", errors="replace"))
+        return extractor.title, extractor.links
+
+    title = None
+    links = []
+    with file_path.open("rb") as f:
+        if not f.peek(1):
+            return "", []  # iterparse raises on an empty document
+        for _, elem in lxml.etree.iterparse(
+            f, tag=("a", "title"), html=True, recover=True, encoding="utf-8"
+        ):
+            # Join text runs with spaces like LinkExtractor, so "<b>19</b>Scanning"
+            # reads "19 Scanning" with either parser
+            text = " ".join(" ".join(elem.itertext()).split())
+            # Anything inside an <a> (an SVG icon <title>, say) is still part
+            # of that link's text, so it is left for the <a> to clean up
+            in_link = next(elem.iterancestors("a"), None) is not None
+            if elem.tag == "title":
+                # Fires once in <head>, so there is nothing worth freeing
+                if title is None and not in_link:
+                    title = text
+                continue
+            href = elem.get("href")
+            if href:
+                links.append((href, text))
+            if in_link:
+                continue
+            # Free the element and all finished content before it: earlier
+            # siblings of the element and of each of its ancestors
+            elem.clear(keep_tail=True)
+            for node in (elem, *elem.iterancestors()):
+                parent = node.getparent()
+                if parent is None:
+                    break  # the root's siblings are top-level comments/PIs
+                while node.getprevious() is not None:
+                    del parent[0]
+    return title or "", links
+
+
+def extract_links_regex(file_path):
+    """Return (title, [(href, link_text)]) for an HTML file using regexes.
+
+    Much faster than either parser since the scanning runs inside re, but
+    it only approximates them: it can miss or misread links in malformed
+    markup, e.g. unclosed <a> tags or a '>' inside an attribute value.
+    Used with --fast-parse.
+    """
+    # A space, not "", so "foo<!--c-->bar" reads "foo bar" as with the parsers
+    content = HIDDEN_RE.sub(b" ", file_path.read_bytes())
+
+    links = []
+    link_spans = []
+    for match in ANCHOR_RE.finditer(content):
+        link_spans.append(match.span())
+        href_dq, href_sq, href_bare, inner = match.groups()
+        href = href_dq if href_dq is not None else href_sq if href_sq is not None else href_bare
+        if not href:
+            continue
+        text = TAG_RE.sub(b" ", inner).decode("utf-8", errors="replace")
+        links.append((
+            html.unescape(href.decode("utf-8", errors="replace")),
+            " ".join(html.unescape(text).split()),
+        ))
+
+    # First <title> outside any link (those inside are SVG icon labels)
+    title = ""
+    for match in TITLE_RE.finditer(content):
+        if not any(start < match.start() < end for start, end in link_spans):
+            title = " ".join(html.unescape(match.group(1).decode("utf-8", errors="replace")).split())
+            break
+    return title, links
 
 
 def init_db():
     """Create or update the SQLite database schema."""
     conn = sqlite3.connect(str(DB_PATH))
     conn.execute("PRAGMA journal_mode=WAL")
+    # The DB is rebuilt by every scan, so trade crash durability for write
+    # speed: NORMAL is still corruption-safe under WAL, it just skips the
+    # fsync on each commit. The rest enlarge the page cache (64 MB), keep
+    # temp b-trees in RAM and checkpoint the WAL less often.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA wal_autocheckpoint=10000")
     conn.executescript("""
         CREATE TABLE IF NOT EXISTS pages (
             url TEXT PRIMARY KEY,
@@ -128,7 +271,11 @@ def init_db():
             checked_at TEXT NOT NULL
         );
 
-        CREATE INDEX IF NOT EXISTS idx_links_source ON links(source_url);
+        -- Covers generate_summary's per-page scan (id included to match its
+        -- ORDER BY), so it never touches the table; replaces idx_links_source.
+        DROP INDEX IF EXISTS idx_links_source;
+        CREATE INDEX IF NOT EXISTS idx_links_src_cover
+            ON links(source_url, link_type, target_url, id, link_text, http_status);
         CREATE INDEX IF NOT EXISTS idx_links_target ON links(target_url);
         CREATE INDEX IF NOT EXISTS idx_links_status ON links(http_status);
         CREATE INDEX IF NOT EXISTS idx_history_url ON check_history(target_url);
@@ -139,18 +286,29 @@ def init_db():
 
 
 def find_html_files():
-    """Find all publishable HTML files in the site."""
+    """Find all publishable HTML files in the site.
+
+    Returns (files, url_paths), where url_paths is the set of URL paths
+    that exist on disk: every file and directory ("/style.css", "/cameras")
+    plus "/dir/" for each directory with an index.html. Internal links are
+    checked against it instead of hitting the filesystem per link.
+    """
     files = []
-    for path in sorted(SITE_ROOT.rglob("*.html")):
+    url_paths = set()
+    for path in sorted(SITE_ROOT.rglob("*")):
         rel = path.relative_to(SITE_ROOT)
         parts = rel.parts
         # Skip hidden dirs, node_modules, etc.
         if any(p.startswith(".") or p.startswith("_") or p == "node_modules" for p in parts):
             continue
-        if rel.name in SKIP_FILES:
+        url_path = "/" + rel.as_posix()
+        url_paths.add(url_path)
+        if rel.name == "index.html":
+            url_paths.add(url_path[: -len("index.html")])
+        if rel.suffix != ".html" or rel.name in SKIP_FILES or path.is_dir():
             continue
         files.append(path)
-    return files
+    return files, url_paths
 
 
 def file_to_url(file_path):
@@ -172,9 +330,21 @@ def classify_link(href, page_url):
     if not href:
         return None, None
     href = href.strip()
-    if href.startswith("#") or href.startswith("mailto:") or href.startswith("javascript:") or href.startswith("tel:"):
+    if SKIP_LINK_RE.match(href):
         return None, None
 
+    # Absolute links to our own site need no resolving, just the fragment cut
+    if SITE_URL_RE.match(href):
+        return "internal", href.split("#", 1)[0]
+    # Any other fully qualified URL is off-site, and urljoin would return it as is
+    if EXTERNAL_URL_RE.match(href):
+        return "external", href
+    # Root-relative paths just get the site prefix (unless they have dot
+    # segments, or are protocol-relative "//host" links, which urljoin handles)
+    if href[:1] == "/" and href[:2] != "//" and "/." not in href:
+        return "internal", BASE_URL + href.split("#", 1)[0]
+
+    # Only relative paths (foo.html, ../bar/) need full resolution
     resolved = urljoin(page_url, href)
     parsed = urlparse(resolved)
 
@@ -186,15 +356,62 @@ def classify_link(href, page_url):
         return "external", resolved
 
 
-def check_url(url, timeout=15):
-    """Check a URL's HTTP status. Returns (status_code, response_time_ms)."""
-    ctx = ssl.create_default_context()
+if requests is not None:
+    # Keep-alive session shared by the checker threads, so repeat hits on
+    # the same host (wikipedia, flickr, ...) skip the TCP+TLS handshake.
+    _SESSION = requests.Session()
+    _SESSION.headers["User-Agent"] = USER_AGENT
+    _adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+    _SESSION.mount("http://", _adapter)
+    _SESSION.mount("https://", _adapter)
+
+# Shared by the urllib fallback; building a context per request is slow
+_SSL_CONTEXT = ssl.create_default_context()
+
+
+def check_url(url, timeout=15, if_modified_since=None):
+    """Check a URL's HTTP status. Returns (status_code, response_time_ms).
+
+    If if_modified_since (an HTTP date) is given it is sent as a
+    conditional request header, so an unchanged page may answer 304.
+    """
+    headers = {"If-Modified-Since": if_modified_since} if if_modified_since else {}
+    if requests is None:
+        return _check_url_urllib(url, timeout, headers)
+
     start = time.time()
 
     # Try HEAD first (faster)
     try:
-        req = urllib.request.Request(url, method="HEAD", headers={"User-Agent": USER_AGENT})
-        resp = urllib.request.urlopen(req, timeout=timeout, context=ctx)
+        resp = _SESSION.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        resp.close()
+        # Some servers reject HEAD, try GET for 403/405
+        if resp.status_code not in (403, 405):
+            elapsed = int((time.time() - start) * 1000)
+            return resp.status_code, elapsed
+    except Exception:
+        pass
+
+    # Fallback to GET (headers only, the body is never read)
+    start = time.time()
+    try:
+        resp = _SESSION.get(url, headers=headers, timeout=timeout, stream=True)
+        resp.close()
+        elapsed = int((time.time() - start) * 1000)
+        return resp.status_code, elapsed
+    except Exception:
+        elapsed = int((time.time() - start) * 1000)
+        return 0, elapsed  # 0 = connection failed
+
+
+def _check_url_urllib(url, timeout, headers):
+    """check_url() for when requests isn't installed (no connection reuse)."""
+    start = time.time()
+
+    # Try HEAD first (faster)
+    try:
+        req = urllib.request.Request(url, method="HEAD", headers={"User-Agent": USER_AGENT, **headers})
+        resp = urllib.request.urlopen(req, timeout=timeout, context=_SSL_CONTEXT)
         elapsed = int((time.time() - start) * 1000)
         return resp.status, elapsed
     except urllib.error.HTTPError as e:
@@ -210,8 +427,8 @@ def check_url(url, timeout=15):
     # Fallback to GET
     start = time.time()
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
-        resp = urllib.request.urlopen(req, timeout=timeout, context=ctx)
+        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **headers})
+        resp = urllib.request.urlopen(req, timeout=timeout, context=_SSL_CONTEXT)
         elapsed = int((time.time() - start) * 1000)
         return resp.status, elapsed
     except urllib.error.HTTPError as e:
@@ -222,249 +439,355 @@ def check_url(url, timeout=15):
         return 0, elapsed  # 0 = connection failed
 
 
-def check_internal_link(target_url):
-    """Check if an internal link resolves to a local file."""
-    parsed = urlparse(target_url)
-    path = parsed.path
+def parse_file(file_path, fast=False):
+    """Read and parse one HTML file (runs in a worker process).
 
-    if path.endswith("/"):
-        local_path = SITE_ROOT / path.lstrip("/") / "index.html"
-    else:
-        local_path = SITE_ROOT / path.lstrip("/")
+    Returns (page_url, rel_path, title, links, error); on a parse failure
+    title and links are None and error holds the message. fast selects
+    extract_links_regex() over extract_links().
+    """
+    page_url = file_to_url(file_path)
+    rel_path = str(file_path.relative_to(SITE_ROOT))
 
-    return 200 if local_path.exists() else 404
+    try:
+        title, links = (extract_links_regex if fast else extract_links)(file_path)
+    except Exception as e:
+        return page_url, rel_path, None, None, str(e)
+    return page_url, rel_path, title, links, None
 
 
-def scan_pages(conn):
+def scan_pages(conn, fast_parse=False):
     """Scan all HTML files, extract links, and store in the database."""
-    now = datetime.utcnow().isoformat() + "Z"
-    files = find_html_files()
+    now = datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+    files, url_paths = find_html_files()
     print(f"Scanning {len(files)} HTML files...")
 
-    # Clear old link data (we rebuild on each scan)
-    conn.execute("DELETE FROM links")
-    conn.execute("DELETE FROM pages")
-    conn.commit()
-
-    total_links = 0
-    for file_path in files:
-        page_url = file_to_url(file_path)
-        rel_path = str(file_path.relative_to(SITE_ROOT))
-
-        content = file_path.read_text(encoding="utf-8", errors="replace")
-        extractor = LinkExtractor()
-        try:
-            extractor.feed(content)
-        except Exception as e:
-            print(f"  Warning: parse error in {rel_path}: {e}")
-            continue
-
-        # Store page
-        conn.execute(
-            "INSERT OR REPLACE INTO pages (url, file_path, title, link_count, last_scanned) VALUES (?, ?, ?, ?, ?)",
-            (page_url, rel_path, extractor.title, len(extractor.links), now),
-        )
-
-        # Store links
-        for href, text in extractor.links:
-            link_type, resolved = classify_link(href, page_url)
-            if link_type is None:
+    # (source_url, target_url, link_text) -> row; pages repeat the same nav
+    # links, so dedupe here and insert without the UNIQUE conflict check.
+    link_rows = {}
+    # Classification memo: the same nav/footer hrefs recur on every page.
+    # Absolute and root-relative hrefs resolve the same anywhere, so they
+    # are keyed on the href alone; page-relative ones also on the page.
+    # Values are (link_type, resolved_url, status).
+    resolve_cache = {}
+    # Parsing is spread over worker processes; all DB access stays on this
+    # thread, in one transaction for the whole rebuild, so a crash leaves
+    # the previous scan's data intact instead of a half-empty table.
+    with conn, ProcessPoolExecutor() as pool:
+        # Clear old link data (we rebuild on each scan)
+        conn.execute("DELETE FROM links")
+        conn.execute("DELETE FROM pages")
+
+        for page_url, rel_path, title, links, error in pool.map(
+            partial(parse_file, fast=fast_parse), files, chunksize=8
+        ):
+            if error is not None:
+                print(f"  Warning: parse error in {rel_path}: {error}")
                 continue
 
-            # Check internal links immediately (fast, local file check)
-            status = None
-            checked = None
-            if link_type == "internal":
-                status = check_internal_link(resolved)
-                checked = now
-
+            # Store page
             conn.execute(
-                """INSERT OR REPLACE INTO links (source_url, target_url, link_text, link_type, http_status, last_checked)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (page_url, resolved, text, link_type, status, checked),
+                "INSERT OR REPLACE INTO pages (url, file_path, title, link_count, last_scanned) VALUES (?, ?, ?, ?, ?)",
+                (page_url, rel_path, title, len(links), now),
             )
-            total_links += 1
 
-        conn.commit()
+            # Collect links
+            for href, text in links:
+                cache_key = href if href.startswith(("/", "http://", "https://")) else (page_url, href)
+                cached = resolve_cache.get(cache_key)
+                if cached is None:
+                    link_type, resolved = classify_link(href, page_url)
+                    # Check internal links immediately (set lookup, no filesystem access)
+                    status = None
+                    if link_type == "internal":
+                        status = 200 if (urlparse(resolved).path or "/") in url_paths else 404
+                    cached = resolve_cache[cache_key] = (link_type, resolved, status)
+                link_type, resolved, status = cached
+                if link_type is None:
+                    continue
+                key = (page_url, resolved, text)
+                if key in link_rows:
+                    continue
+
+                checked = now if link_type == "internal" else None
+                link_rows[key] = (page_url, resolved, text, link_type, status, checked)
+
+        # Store links
+        conn.executemany(
+            """INSERT INTO links (source_url, target_url, link_text, link_type, http_status, last_checked)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            link_rows.values(),
+        )
 
+    total_links = len(link_rows)
     print(f"Found {total_links} links across {len(files)} pages.")
     return total_links
 
 
-def check_external_links(conn):
-    """Check all external links and record results."""
-    now = datetime.utcnow().isoformat() + "Z"
-    rows = conn.execute(
-        "SELECT DISTINCT target_url FROM links WHERE link_type = 'external' ORDER BY target_url"
-    ).fetchall()
+def _http_date(timestamp):
+    """Convert a stored ISO 8601 UTC timestamp to an HTTP date string."""
+    dt = datetime.fromisoformat(timestamp.rstrip("Z")).replace(tzinfo=timezone.utc)
+    return format_datetime(dt, usegmt=True)
 
-    print(f"\nChecking {len(rows)} unique external URLs...")
-    checked = 0
-    broken = 0
 
-    for (url,) in rows:
-        checked += 1
-        status, response_ms = check_url(url)
+def check_external_links(conn, recheck=False):
+    """Check external links concurrently and record results.
 
-        # Update all link rows pointing to this URL
-        conn.execute(
-            "UPDATE links SET http_status = ?, last_checked = ? WHERE target_url = ?",
-            (status, now, url),
-        )
+    URLs that checked OK within the last FRESH_HOURS keep their cached
+    status. Older OK results are re-checked with If-Modified-Since, and
+    a 304 reply keeps the previous status. recheck=True checks everything.
+    """
+    now = datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+    rows = conn.execute(
+        "SELECT DISTINCT target_url FROM links WHERE link_type = 'external' ORDER BY target_url"
+    ).fetchall()
 
-        # Record in history
-        conn.execute(
-            "INSERT INTO check_history (target_url, http_status, response_time_ms, checked_at) VALUES (?, ?, ?, ?)",
-            (url, status, response_ms, now),
+    # Latest check per URL (SQLite takes http_status from the MAX() row)
+    last_checks = {
+        url: (checked_at, status)
+        for url, checked_at, status in conn.execute(
+            "SELECT target_url, MAX(checked_at), http_status FROM check_history GROUP BY target_url"
         )
+    }
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=FRESH_HOURS)).strftime(TIMESTAMP_FORMAT)
 
-        icon = "ok" if 200 <= status < 400 else "BROKEN" if status in (0, 404, 410) else "warn"
-        if icon == "BROKEN":
-            broken += 1
-        if icon != "ok":
-            print(f"  [{status:>3}] {url}")
-        elif checked % 10 == 0:
-            print(f"  ...checked {checked}/{len(rows)}")
+    updates = []  # (status, last_checked, url)
+    if_modified_since = {}
+    to_check = []
+    for (url,) in rows:
+        checked_at, status = last_checks.get(url, (None, None))
+        if not recheck and status is not None and 200 <= status < 400:
+            if checked_at > cutoff:
+                updates.append((status, checked_at, url))
+                continue
+            if_modified_since[url] = _http_date(checked_at)
+        to_check.append(url)
+
+    if updates:
+        print(f"\nReusing {len(updates)} external URLs checked OK in the last {FRESH_HOURS}h.")
+
+    # Group by host so politeness limits apply per server, then interleave
+    # the groups so workers aren't all queued up behind one busy host.
+    by_host = {}
+    for url in to_check:
+        by_host.setdefault(urlparse(url).netloc, []).append(url)
+    urls = [url for batch in zip_longest(*by_host.values()) for url in batch if url is not None]
+
+    host_slots = {host: threading.Semaphore(HOST_CONCURRENCY) for host in by_host}
+    host_next = {}  # host -> earliest time.monotonic() the next request may start
+    host_next_lock = threading.Lock()
+
+    stopping = threading.Event()  # set on the way out; queued checks then bail
+
+    def check(url):
+        host = urlparse(url).netloc
+        with host_slots[host]:
+            # Reserve the next start slot for this host, then wait for it
+            with host_next_lock:
+                start = max(time.monotonic(), host_next.get(host, 0.0))
+                host_next[host] = start + HOST_DELAY
+            delay = start - time.monotonic()
+            if delay > 0:
+                stopping.wait(delay)
+            if stopping.is_set():
+                return None
+            return check_url(url, if_modified_since=if_modified_since.get(url))
+
+    print(f"\nChecking {len(urls)} unique external URLs across {len(by_host)} hosts...")
+    checked = 0
+    broken = 0
+    history = []
+
+    def save_results():
+        # Commit in batches so an interrupted run keeps what it has checked
+        with conn:
+            # Update all link rows pointing to each URL
+            conn.executemany(
+                "UPDATE links SET http_status = ?, last_checked = ? WHERE target_url = ?",
+                updates,
+            )
+            # Record in history
+            conn.executemany(
+                "INSERT INTO check_history (target_url, http_status, response_time_ms, checked_at) VALUES (?, ?, ?, ?)",
+                history,
+            )
+        updates.clear()
+        history.clear()
 
-        conn.commit()
-        time.sleep(0.3)  # rate limit
+    # Not a with-block: its exit waits for every queued check, so Ctrl-C
+    # would hang until all URLs were done.
+    pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        futures = {pool.submit(check, url): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            status, response_ms = future.result()
+            if status == 304 and url in if_modified_since:
+                status = last_checks[url][1]  # unchanged since the last OK check
+            checked += 1
+            updates.append((status, now, url))
+            history.append((url, status, response_ms, now))
+
+            icon = "ok" if 200 <= status < 400 else "BROKEN" if status in (0, 404, 410) else "warn"
+            if icon == "BROKEN":
+                broken += 1
+            if icon != "ok":
+                print(f"  [{status:>3}] {url}")
+            elif checked % 10 == 0:
+                print(f"  ...checked {checked}/{len(urls)}")
+
+            if len(history) >= COMMIT_EVERY:
+                save_results()
+    finally:
+        stopping.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        # Also on error or Ctrl-C, so the last partial batch isn't lost
+        save_results()
 
     print(f"Done. {broken} broken, {checked - broken} ok out of {checked} URLs.")
 
 
 def generate_summary(conn):
     """Generate link_summary.md from the database."""
-    now = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
     pages = conn.execute(
         "SELECT url, file_path, title, link_count FROM pages ORDER BY file_path"
     ).fetchall()
 
-    # Stats
-    total_links = conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
-    internal_count = conn.execute("SELECT COUNT(*) FROM links WHERE link_type='internal'").fetchone()[0]
-    external_count = conn.execute("SELECT COUNT(*) FROM links WHERE link_type='external'").fetchone()[0]
-    broken_internal = conn.execute(
-        "SELECT COUNT(*) FROM links WHERE link_type='internal' AND http_status=404"
-    ).fetchone()[0]
-    broken_external = conn.execute(
-        "SELECT COUNT(*) FROM links WHERE link_type='external' AND http_status IN (0, 404, 410)"
-    ).fetchone()[0]
-    unchecked = conn.execute(
-        "SELECT COUNT(*) FROM links WHERE link_type='external' AND http_status IS NULL"
-    ).fetchone()[0]
-
-    lines = []
-    lines.append(f"# metergeist.com Link Audit")
-    lines.append(f"")
-    lines.append(f"Generated: {now}")
-    lines.append(f"")
-    lines.append(f"## Summary")
-    lines.append(f"")
-    lines.append(f"| Metric | Count |")
-    lines.append(f"|--------|-------|")
-    lines.append(f"| Pages scanned | {len(pages)} |")
-    lines.append(f"| Total links | {total_links} |")
-    lines.append(f"| Internal links | {internal_count} |")
-    lines.append(f"| External links | {external_count} |")
-    lines.append(f"| Broken internal | {broken_internal} |")
-    lines.append(f"| Broken external | {broken_external} |")
-    if unchecked:
-        lines.append(f"| Unchecked external | {unchecked} |")
-    lines.append(f"")
-
-    # Broken links section (if any)
-    broken_rows = conn.execute(
+    # Stats, tallied from a single grouped scan
+    counts = {
+        (ltype, status): n
+        for ltype, status, n in conn.execute(
+            "SELECT link_type, http_status, COUNT(*) FROM links GROUP BY link_type, http_status"
+        )
+    }
+    total_links = sum(counts.values())
+    internal_count = sum(n for (ltype, _), n in counts.items() if ltype == "internal")
+    external_count = sum(n for (ltype, _), n in counts.items() if ltype == "external")
+    broken_internal = counts.get(("internal", 404), 0)
+    broken_external = sum(
+        n for (ltype, status), n in counts.items() if ltype == "external" and status in (0, 404, 410)
+    )
+    unchecked = counts.get(("external", None), 0)
+
+    # Broken links and warnings (403, 5xx) in one query, split below
+    broken_rows = []
+    warn_rows = []
+    for row in conn.execute(
         """SELECT l.source_url, l.target_url, l.link_text, l.http_status, l.link_type
            FROM links l
            WHERE l.http_status IN (0, 404, 410)
-              OR (l.link_type = 'internal' AND l.http_status = 404)
-           ORDER BY l.http_status, l.source_url"""
-    ).fetchall()
-
-    if broken_rows:
-        lines.append(f"## Broken Links")
-        lines.append(f"")
-        lines.append(f"| Status | Source | Target | Link Text |")
-        lines.append(f"|--------|--------|--------|-----------|")
-        for source, target, text, status, ltype in broken_rows:
-            src_short = source.replace(BASE_URL, "")
-            tgt_short = target.replace(BASE_URL, "") if ltype == "internal" else target
-            text_short = (text[:40] + "...") if len(text) > 43 else text
-            lines.append(f"| {status} | `{src_short}` | `{tgt_short}` | {text_short} |")
-        lines.append(f"")
-
-    # Warnings (403, 5xx)
-    warn_rows = conn.execute(
-        """SELECT l.source_url, l.target_url, l.link_text, l.http_status
-           FROM links l
-           WHERE l.link_type = 'external'
-             AND l.http_status IS NOT NULL
-             AND l.http_status NOT IN (0, 200, 301, 302, 303, 307, 308, 404, 410)
+              OR (l.link_type = 'external'
+                  AND l.http_status IS NOT NULL
+                  AND l.http_status NOT IN (0, 200, 301, 302, 303, 307, 308, 404, 410))
            ORDER BY l.http_status, l.source_url"""
-    ).fetchall()
+    ):
+        if row[3] in (0, 404, 410):
+            broken_rows.append(row)
+        else:
+            warn_rows.append(row[:4])
+
+    # Stream straight to disk rather than joining one huge string at the end
+    with SUMMARY_PATH.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        write = f.write
+        write("# metergeist.com Link Audit\n")
+        write("\n")
+        write(f"Generated: {now}\n")
+        write("\n")
+        write("## Summary\n")
+        write("\n")
+        write("| Metric | Count |\n")
+        write("|--------|-------|\n")
+        write(f"| Pages scanned | {len(pages)} |\n")
+        write(f"| Total links | {total_links} |\n")
+        write(f"| Internal links | {internal_count} |\n")
+        write(f"| External links | {external_count} |\n")
+        write(f"| Broken internal | {broken_internal} |\n")
+        write(f"| Broken external | {broken_external} |\n")
+        if unchecked:
+            write(f"| Unchecked external | {unchecked} |\n")
+        write("\n")
+
+        # Broken links section (if any)
+        if broken_rows:
+            write("## Broken Links\n")
+            write("\n")
+            write("| Status | Source | Target | Link Text |\n")
+            write("|--------|--------|--------|-----------|\n")
+            for source, target, text, status, ltype in broken_rows:
+                src_short = source.replace(BASE_URL, "")
+                tgt_short = target.replace(BASE_URL, "") if ltype == "internal" else target
+                text_short = (text[:40] + "...") if len(text) > 43 else text
+                write(f"| {status} | `{src_short}` | `{tgt_short}` | {text_short} |\n")
+            write("\n")
+
+        # Warnings (403, 5xx)
+        if warn_rows:
+            write("## Warnings (non-200, non-404)\n")
+            write("\n")
+            write("| Status | Source | Target | Link Text |\n")
+            write("|--------|--------|--------|-----------|\n")
+            for source, target, text, status in warn_rows:
+                src_short = source.replace(BASE_URL, "")
+                text_short = (text[:40] + "...") if len(text) > 43 else text
+                write(f"| {status} | `{src_short}` | `{target}` | {text_short} |\n")
+            write("\n")
+
+        # Per-page breakdown, from one pass over all links grouped by page
+        links_by_page = {
+            source: [row[1:] for row in rows]
+            for source, rows in groupby(
+                conn.execute(
+                    """SELECT source_url, target_url, link_text, link_type, http_status
+                       FROM links ORDER BY source_url, link_type, target_url, id"""
+                ),
+                key=itemgetter(0),
+            )
+        }
+
+        write("## Pages\n")
+        write("\n")
+
+        for page_url, file_path, title, link_count in pages:
+            page_short = page_url.replace(BASE_URL, "")
+            write(f"### `{page_short}`\n")
+            write("\n")
+            write(f"**{title}** ({link_count} links)\n")
+            write("\n")
+
+            page_links = links_by_page.get(page_url)
+            if not page_links:
+                write("No links found.\n")
+                write("\n")
+                continue
 
-    if warn_rows:
-        lines.append(f"## Warnings (non-200, non-404)")
-        lines.append(f"")
-        lines.append(f"| Status | Source | Target | Link Text |")
-        lines.append(f"|--------|--------|--------|-----------|")
-        for source, target, text, status in warn_rows:
-            src_short = source.replace(BASE_URL, "")
-            text_short = (text[:40] + "...") if len(text) > 43 else text
-            lines.append(f"| {status} | `{src_short}` | `{target}` | {text_short} |")
-        lines.append(f"")
-
-    # Per-page breakdown
-    lines.append(f"## Pages")
-    lines.append(f"")
-
-    for page_url, file_path, title, link_count in pages:
-        page_short = page_url.replace(BASE_URL, "")
-        lines.append(f"### `{page_short}`")
-        lines.append(f"")
-        lines.append(f"**{title}** ({link_count} links)")
-        lines.append(f"")
-
-        page_links = conn.execute(
-            """SELECT target_url, link_text, link_type, http_status
-               FROM links WHERE source_url = ? ORDER BY link_type, target_url""",
-            (page_url,),
-        ).fetchall()
-
-        if not page_links:
-            lines.append(f"No links found.")
-            lines.append(f"")
-            continue
+            # Internal links
+            internal = [(t, txt, s) for t, txt, lt, s in page_links if lt == "internal"]
+            if internal:
+                write(f"**Internal ({len(internal)}):**\n")
+                for target, text, status in internal:
+                    tgt_short = target.replace(BASE_URL, "")
+                    icon = "x" if status == 404 else " "
+                    write(f"- [{icon}] `{tgt_short}` — {text}\n")
+                write("\n")
+
+            # External links
+            external = [(t, txt, s) for t, txt, lt, s in page_links if lt == "external"]
+            if external:
+                write(f"**External ({len(external)}):**\n")
+                for target, text, status in external:
+                    if status is None:
+                        icon = "?"
+                    elif 200 <= status < 400:
+                        icon = " "
+                    elif status in (0, 404, 410):
+                        icon = "x"
+                    else:
+                        icon = "!"
+                    write(f"- [{icon}] [{status or '?'}] {target} — {text}\n")
+                write("\n")
 
-        # Internal links
-        internal = [(t, txt, s) for t, txt, lt, s in page_links if lt == "internal"]
-        if internal:
-            lines.append(f"**Internal ({len(internal)}):**")
-            for target, text, status in internal:
-                tgt_short = target.replace(BASE_URL, "")
-                icon = "x" if status == 404 else " "
-                lines.append(f"- [{icon}] `{tgt_short}` — {text}")
-            lines.append(f"")
-
-        # External links
-        external = [(t, txt, s) for t, txt, lt, s in page_links if lt == "external"]
-        if external:
-            lines.append(f"**External ({len(external)}):**")
-            for target, text, status in external:
-                if status is None:
-                    icon = "?"
-                elif 200 <= status < 400:
-                    icon = " "
-                elif status in (0, 404, 410):
-                    icon = "x"
-                else:
-                    icon = "!"
-                lines.append(f"- [{icon}] [{status or '?'}] {target} — {text}")
-            lines.append(f"")
-
-    content = "\n".join(lines) + "\n"
-    SUMMARY_PATH.write_text(content, encoding="utf-8")
     print(f"\nSummary written to {SUMMARY_PATH}")
 
 
@@ -500,8 +823,14 @@ def show_broken(conn):
 def main():
     parser = argparse.ArgumentParser(description="Link audit tool for metergeist.com")
     parser.add_argument("--local-only", action="store_true", help="Scan links without checking external URLs")
+    parser.add_argument(
+        "--fast-parse", action="store_true", help="Extract links with regexes (faster, may miss links in malformed HTML)"
+    )
     parser.add_argument("--summary", action="store_true", help="Regenerate summary from existing DB data")
     parser.add_argument("--broken", action="store_true", help="Show broken links from DB")
+    parser.add_argument(
+        "--recheck", action="store_true", help=f"Re-check external URLs that checked OK in the last {FRESH_HOURS}h"
+    )
     args = parser.parse_args()
 
     os.chdir(SITE_ROOT)
@@ -517,10 +846,10 @@ def main():
         conn.close()
         return
 
-    scan_pages(conn)
+    scan_pages(conn, fast_parse=args.fast_parse)
 
     if not args.local_only:
-        check_external_links(conn)
+        check_external_links(conn, recheck=args.recheck)
 
     generate_summary(conn)
     show_broken(conn)